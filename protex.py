@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""
+r"""
 ProTeX v2.00 - Translates Code Prologues to LaTeX (Python Version)
 ===================================================================
 
@@ -69,11 +69,210 @@ See Also:
     DAO Office Note 97-11.
 """
 
+import io
 import sys
 import os
+import re
+import json
+import hashlib
 import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 
+# Matches the first one or two whitespace-separated tokens of an
+# already-stripped line.  Used in process_file to identify a potential
+# marker without tokenizing the whole line.
+_MARKER_RE = re.compile(r"(\S+)(?:\s+(\S+))?")
+
+# Translation table that escapes "_" for LaTeX; str.translate runs in C and
+# is faster than str.replace for this single-character substitution.
+_UNDERSCORE_TBL = str.maketrans({"_": r"\_"})
+
+# Words that mark a keyword as an "emphasized" (italic) section header.
+_EM_WORDS = ("USES", "INPUT", "OUTPUT", "PARAMETERS", "VALUE", "ARGUMENTS")
+
+# Cache of compiled keyword patterns, keyed by the tuple of keywords.
+_KEY_PATTERNS = {}
+
+# Maximum number of entries kept in the on-disk output cache (--cache).
+_CACHE_LIMIT = 4096
+
+
+def cache_dir():
+    """Returns the on-disk output cache directory, creating it if needed.
+
+    Honors XDG_CACHE_HOME and falls back to ~/.cache.
+
+    Returns:
+        str: Path of the cache directory.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(base, "protex")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_key(filename, stat_result, state, tokens, opts):
+    """Computes the cache key for one input file.
+
+    The key covers everything the generated LaTeX depends on: the file
+    identity (path, mtime, size), the selected language, the relevant
+    command-line options, and the document state the file is entered with
+    (output is order-dependent, e.g. only the first prologue opens the
+    prologue section).
+
+    Args:
+        filename (str): Name of the input file.
+        stat_result (os.stat_result): Stat of the input file.
+        state (dict): Global state of the document before this file.
+        tokens (dict): Dictionary of markup tokens for the selected language.
+        opts (argparse.Namespace): Command-line options.
+
+    Returns:
+        str: Hex digest identifying the cache entry.
+    """
+    payload = repr((
+        os.path.abspath(filename), stat_result.st_mtime_ns, stat_result.st_size,
+        sorted(state.items()), tokens["comment"],
+        opts.bare, opts.n, opts.l, opts.s, opts.nolatex, opts.f,
+        opts.internal, opts.style, tuple(opts.keys),
+    ))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def cache_load(path):
+    """Loads one cache entry.
+
+    Args:
+        path (str): Path of the cache entry file.
+
+    Returns:
+        dict or None: The stored entry ({"output", "state", "run_date"}), or
+        None when the entry is missing or unreadable.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        if all(k in entry for k in ("output", "state", "run_date")):
+            return entry
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def cache_store(path, output, state, run_date):
+    """Stores one cache entry, evicting the oldest entries over the cap.
+
+    Cache failures are deliberately silent: the cache is an optimization and
+    must never fail a documentation build.
+
+    Args:
+        path (str): Path of the cache entry file.
+        output (str): Generated LaTeX output for the file.
+        state (dict): Global state of the document after the file.
+        run_date (str): Timestamp embedded in the stored output.
+
+    Returns:
+        None
+    """
+    try:
+        directory = os.path.dirname(path)
+        entries = [os.path.join(directory, e) for e in os.listdir(directory)]
+        if len(entries) >= _CACHE_LIMIT:
+            entries.sort(key=os.path.getmtime)
+            for stale in entries[:len(entries) - _CACHE_LIMIT + 1]:
+                os.remove(stale)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"output": output, "state": state, "run_date": run_date}, f)
+    except OSError:
+        pass
+
+
+def compile_keys(keys):
+    """Builds (and caches) the search machinery for optional keyword markers.
+
+    Instead of scanning each line for every keyword in turn, all keywords are
+    combined into a single alternation regex, and the italic-vs-sans-serif
+    classification is precomputed per keyword.
+
+    Args:
+        keys (list of str): Keyword markers (e.g., "!INTERFACE:").
+
+    Returns:
+        tuple: A compiled regex matching any of the keywords (or None when the
+        list is empty), and the set of keywords typeset with {\\em ...}.
+    """
+    keys_tuple = tuple(keys)
+    cached = _KEY_PATTERNS.get(keys_tuple)
+    if cached is None:
+        pattern = re.compile("|".join(re.escape(k) for k in keys)) if keys else None
+        em_keys = {k for k in keys if any(w in k for w in _EM_WORDS)}
+        cached = _KEY_PATTERNS[keys_tuple] = (pattern, em_keys)
+    return cached
+
+
+# Static document text, preassembled so each block is emitted with a single
+# write instead of one print (and one flush) per line.
+_NOTICE = (
+    "%                **** IMPORTANT NOTICE *****\n"
+    "% This LaTeX file was automatically generated by ProTeX (Python version)\n"
+    "% Any changes made to this file will likely be lost next time\n"
+    "% it is regenerated from its source. Send questions to your_email@example.com\n"
+    "\n"
+)
+
+_PREAMBLE_HEADER = "%------------------------ PREAMBLE --------------------------\n"
+
+_PREAMBLE_BODY = (
+    "\\textheight     9in\n"
+    "\\topmargin      0pt\n"
+    "\\headsep        1cm\n"
+    "\\headheight     0pt\n"
+    "\\textwidth      6in\n"
+    "\\oddsidemargin  0in\n"
+    "\\evensidemargin 0in\n"
+    "\\marginparpush  0pt\n"
+    "\\pagestyle{myheadings}\n"
+    "\\markboth{}{}\n"
+    "%-------------------------------------------------------------\n"
+    "\\setlength{\\parskip}{0pt}\n"
+    "\\setlength{\\parindent}{0pt}\n"
+    "\\setlength{\\baselineskip}{11pt}\n"
+)
+
+_MACROS = (
+    "\n"
+    "%--------------------- SHORT-HAND MACROS ----------------------\n"
+    "\\def\\bv{\\begin{verbatim}}\n"
+    "\\def\\ev{\\end{verbatim}}\n"
+    "\\def\\be{\\begin{equation}}\n"
+    "\\def\\ee{\\end{equation}}\n"
+    "\\def\\bea{\\begin{eqnarray}}\n"
+    "\\def\\eea{\\end{eqnarray}}\n"
+    "\\def\\bi{\\begin{itemize}}\n"
+    "\\def\\ei{\\end{itemize}}\n"
+    "\\def\\bn{\\begin{enumerate}}\n"
+    "\\def\\en{\\end{enumerate}}\n"
+    "\\def\\bd{\\begin{description}}\n"
+    "\\def\\ed{\\end{description}}\n"
+    "\\def\\({\\left (}\n"
+    "\\def\\){\\right )}\n"
+    "\\def\\[{\\left [}\n"
+    "\\def\\]{\\right ]}\n"
+    "\\def\\<{\\left \\langle}\n"
+    "\\def\\>{\\right \\rangle}\n"
+    "\\def\\cI{{\\cal I}}\n"
+    "\\def\\diag{\\mathop{\\rm diag}}\n"
+    "\\def\\tr{\\mathop{\\rm tr}}\n"
+    "%-------------------------------------------------------------\n"
+)
+
+# Static boilerplate is pre-encoded so it goes straight to the binary
+# stdout layer without a per-run str -> UTF-8 pass.
+_NOTICE_BYTES = _NOTICE.encode("utf-8")
+_MACROS_BYTES = _MACROS.encode("utf-8")
+_END_DOCUMENT_BYTES = b"\\end{document}\n"
+
 
 def print_notice():
     """Prints the notice header in the LaTeX document.
@@ -84,49 +283,28 @@ def print_notice():
     Returns:
         None
     """
-    print("%                **** IMPORTANT NOTICE *****")
-    print("% This LaTeX file was automatically generated by ProTeX (Python version)")
-    print("% Any changes made to this file will likely be lost next time")
-    print("% it is regenerated from its source. Send questions to your_email@example.com\n")
+    sys.stdout.buffer.write(_NOTICE_BYTES)
 
 
 def print_preamble(custom_style=None):
     """Prints the LaTeX preamble.
 
     If a custom_style is provided, it uses that style (document class) and includes the corresponding package.
-    
+
     Args:
         custom_style (str, optional): The custom document class or style name to use.
-        
+
     Returns:
         None
     """
-    print("%------------------------ PREAMBLE --------------------------")
-    if custom_style:
-        print("\\documentclass[11pt]{" + custom_style + "}")
-    else:
-        print("\\documentclass[11pt]{article}")
-    
-    print("\\usepackage{amsmath}")
-    
+    parts = [_PREAMBLE_HEADER]
+    parts.append("\\documentclass[11pt]{" + (custom_style or "article") + "}\n")
+    parts.append("\\usepackage{amsmath}\n")
     # Se o usuário tiver um arquivo de estilo (por exemplo, myStyle.sty), pode incluí-lo:
     if custom_style:
-        print("\\usepackage{" + custom_style + "}")
-    
-    print("\\textheight     9in")
-    print("\\topmargin      0pt")
-    print("\\headsep        1cm")
-    print("\\headheight     0pt")
-    print("\\textwidth      6in")
-    print("\\oddsidemargin  0in")
-    print("\\evensidemargin 0in")
-    print("\\marginparpush  0pt")
-    print("\\pagestyle{myheadings}")
-    print("\\markboth{}{}")
-    print("%-------------------------------------------------------------")
-    print("\\setlength{\\parskip}{0pt}")
-    print("\\setlength{\\parindent}{0pt}")
-    print("\\setlength{\\baselineskip}{11pt}")
+        parts.append("\\usepackage{" + custom_style + "}\n")
+    parts.append(_PREAMBLE_BODY)
+    sys.stdout.buffer.write("".join(parts).encode("utf-8"))
 
 
 def print_macros():
@@ -137,32 +315,10 @@ def print_macros():
     Returns:
         None
     """
-    print("\n%--------------------- SHORT-HAND MACROS ----------------------")
-    print("\\def\\bv{\\begin{verbatim}}")
-    print("\\def\\ev{\\end{verbatim}}")
-    print("\\def\\be{\\begin{equation}}")
-    print("\\def\\ee{\\end{equation}}")
-    print("\\def\\bea{\\begin{eqnarray}}")
-    print("\\def\\eea{\\end{eqnarray}}")
-    print("\\def\\bi{\\begin{itemize}}")
-    print("\\def\\ei{\\end{itemize}}")
-    print("\\def\\bn{\\begin{enumerate}}")
-    print("\\def\\en{\\end{enumerate}}")
-    print("\\def\\bd{\\begin{description}}")
-    print("\\def\\ed{\\end{description}}")
-    print("\\def\\({\\left (}")
-    print("\\def\\){\\right )}")
-    print("\\def\\[{\\left [}")
-    print("\\def\\]{\\right ]}")
-    print("\\def\\<{\\left \\langle}")
-    print("\\def\\>{\\right \\rangle}")
-    print("\\def\\cI{{\\cal I}}")
-    print("\\def\\diag{\\mathop{\\rm diag}}")
-    print("\\def\\tr{\\mathop{\\rm tr}}")
-    print("%-------------------------------------------------------------")
-
-
-def do_beg(state, bare):
+    sys.stdout.buffer.write(_MACROS_BYTES)
+
+
+def do_beg(state, bare, append):
     """Begins the LaTeX document by printing the header and initial commands.
 
     If bare mode is not active and the header has not been printed yet,
@@ -171,6 +327,7 @@ def do_beg(state, bare):
     Args:
         state (dict): Global state of the document.
         bare (bool): Indicates whether bare mode is active.
+        append (callable): Appends one output line to the file output buffer.
 
     Returns:
         None
@@ -179,18 +336,18 @@ def do_beg(state, bare):
         return
     if not state["begdoc"]:
         if state["tpage"]:
-            print("\\title{" + state["title"] + "}")
-            print("\\author{{\\sc " + state["author"] + "}\\\\ {\\em " + state["affiliation"] + "}}")
-            print("\\date{" + state["doc_date"] + "}")
-        print("\\begin{document}")
+            append("\\title{" + state["title"] + "}")
+            append("\\author{{\\sc " + state["author"] + "}\\\\ {\\em " + state["affiliation"] + "}}")
+            append("\\date{" + state["doc_date"] + "}")
+        append("\\begin{document}")
         if state["tpage"]:
-            print("\\maketitle")
-        print("\\tableofcontents")
-        print("\\newpage")
+            append("\\maketitle")
+        append("\\tableofcontents")
+        append("\\newpage")
         state["begdoc"] = True
 
 
-def do_eoc(state):
+def do_eoc(state, append):
     """Ends a code block in verbatim mode.
 
     If a verbatim block is active, this function prints the command
@@ -198,12 +355,13 @@ def do_eoc(state):
 
     Args:
         state (dict): Global state of the document.
+        append (callable): Appends one output line to the file output buffer.
 
     Returns:
         None
     """
     if state["verb"]:
-        print("\\end{verbatim}")
+        append("\\end{verbatim}")
         state["verb"] = False
     state["source"] = False
 
@@ -227,276 +385,392 @@ def set_missing(state):
     state["name_is"] = "UNKNOWN"
 
 
-def process_file(f, filename, state, tokens, opts):
-    """Processes a source file and generates the corresponding LaTeX output.
+def initial_state():
+    """Creates a fresh global document state.
 
-    This function reads the file line by line, interprets documentation markers
-    (e.g., !BOI, !BOP, !ROUTINE:, !IROUTINE:, !DESCRIPTION:, etc.), and prints the
-    corresponding LaTeX commands.
+    Returns:
+        dict: The document state with no introduction, prologue, or code
+        section active and no title page information captured.
+    """
+    return {
+        "intro": False,
+        "prologue": False,
+        "first": True,
+        "source": False,
+        "verb": False,
+        "tpage": False,
+        "begdoc": False,
+        "not_first": False,
+        "have_name": False,
+        "have_desc": False,
+        "have_intf": False,
+        "have_hist": False,
+        "name_is": "UNKNOWN",
+        "title": "",
+        "author": "",
+        "affiliation": "",
+        "doc_date": ""
+    }
+
+
+def make_processor(state, tokens, opts):
+    """Builds a file-processing function specialized for the current run.
+
+    All run-invariant pieces -- the marker handler table, the compiled
+    keyword pattern, the comment token, and the frequently used options --
+    are resolved once here and bound as closure variables, so the per-line
+    loop of the returned function repeats none of these dict and attribute
+    lookups.
 
     Args:
-        f (file-like object): Open file object for reading.
-        filename (str): Name of the file (or '-' for STDIN).
         state (dict): Global state of the document.
         tokens (dict): Dictionary of markup tokens for the selected language.
         opts (argparse.Namespace): Command-line options.
 
     Returns:
-        None
+        callable: A function with the signature process_file(f, filename,
+        run_date) that processes one source file and writes its LaTeX output
+        to stdout.
     """
-    # Determine base file name and format it (replace underscores with "\_")
-    file_basename = os.path.basename(filename) if filename != '-' else "Standard Input"
-    file_basename = file_basename.replace("_", "\\_")
-    file_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print("\n\\markboth{Left}{Source File: %s,  Date: %s}\n" % (file_basename, file_date))
-    
-    for line in f:
-        line = line.rstrip("\n").lstrip()
-        fields = line.split(maxsplit=9999)
-        # If the line starts with "!", then the real marker is at position 1.
-        mi = 0
-        if fields and fields[0] == '!':
-            mi = 1
-
-        # If there are not enough tokens (e.g., the line is just "!"), skip the line.
-        if len(fields) <= mi:
-            continue
+    # Buffer of output lines, reused across files; each file is emitted
+    # with a single write instead of one print call per line.
+    out = []
+    append = out.append
+
+    key_pattern, em_keys = compile_keys(opts.keys)
+    key_search = key_pattern.search if key_pattern is not None else None
+    comment = tokens["comment"]
+    comment_len = len(comment)
+    bare = opts.bare
+    internal = opts.internal
+    new_page = opts.n
+    no_source_info = opts.f
+    nolatex = opts.nolatex
+
+    # --- Marker handlers ---
+    # Each handler receives the fully tokenized line and the marker index
+    # (0, or 1 when the line starts with a bare "!").  Dispatching through a
+    # dict keyed on the first token avoids comparing every line against each
+    # marker in turn.
+    def handle_quote(fields, mi):
+        """Handles !QUOTE: lines (passed through verbatim to LaTeX)."""
+        append(" ".join(fields[mi+1:]))
+
+    def handle_boi(fields, mi):
+        """Handles the introduction start marker (!BOI)."""
+        state["intro"] = True
+
+    def handle_eoi(fields, mi):
+        """Handles the introduction end marker (!EOI)."""
+        append("\n %/////////////////////////////////////////////////////////////")
+        append("\\newpage")
+        state["intro"] = False
+
+    def handle_bop(fields, mi):
+        """Handles the prologue start marker (!BOP)."""
+        if state["source"]:
+            do_eoc(state, append)
+        append("\n %/////////////////////////////////////////////////////////////")
+        do_beg(state, bare, append)
+        if not state["first"]:
+            append("\n\\mbox{}\\hrulefill\\")
+        else:
+            if not bare:
+                append("\\section{Routine/Function Prologues} \\label{app:ProLogues}")
+        state["first"] = False
+        state["prologue"] = True
+        state["verb"] = False
+        state["source"] = False
+        set_missing(state)
+
+    def handle_bopi(fields, mi):
+        """Handles the internal prologue start marker (!BOPI)."""
+        # A !BOPI prologue is a regular !BOP prologue unless internal
+        # prologues are suppressed, so the shared body lives in handle_bop.
+        if internal:
+            state["prologue"] = False
+        else:
+            handle_bop(fields, mi)
 
-        # --- Processing markers ---
-        # !QUOTE:
-        if len(fields) > mi and fields[mi] == '!QUOTE:':
-            print(" ".join(fields[mi+1:]))
-            continue
+    def handle_eop(fields, mi):
+        """Handles the prologue end markers (!EOP and !EOPI)."""
+        if state["verb"]:
+            append("\\end{verbatim}")
+            state["verb"] = False
+        state["prologue"] = False
+
+    def handle_boc(fields, mi):
+        """Handles the code section start marker (!BOC)."""
+        append("\n %/////////////////////////////////////////////////////////////")
+        state["first"] = False
+        state["prologue"] = False
+        state["source"] = True
+        append("\n\\begin{verbatim}")
+        state["verb"] = True
+
+    def handle_eoc(fields, mi):
+        """Handles the code section end marker (!EOC)."""
+        do_eoc(state, append)
+        state["prologue"] = False
+
+    def handle_boe(fields, mi):
+        """Handles the example prologue start marker (!BOE)."""
+        if state["source"]:
+            do_eoc(state, append)
+        append("\n %/////////////////////////////////////////////////////////////")
+        state["first"] = False
+        state["prologue"] = True
+        state["verb"] = False
+        state["source"] = False
 
-        # Introduction start: !BOI
-        if fields[mi] == tokens["boi"]:
-            state["intro"] = True
-            continue
+    def handle_eoe(fields, mi):
+        """Handles the example prologue end marker (!EOE)."""
+        if state["verb"]:
+            append("\\end{verbatim}")
+            state["verb"] = False
+        state["prologue"] = False
+
+    # Interned keys let the dict lookup (and the literal comparisons below)
+    # short-circuit on pointer identity for tokens interned in the loop.
+    handlers = {
+        '!QUOTE:': handle_quote,
+        sys.intern(tokens["boi"]): handle_boi,
+        sys.intern(tokens["eoi"]): handle_eoi,
+        sys.intern(tokens["bop"]): handle_bop,
+        sys.intern(tokens["bopi"]): handle_bopi,
+        sys.intern(tokens["eop"]): handle_eop,
+        sys.intern(tokens["eopi"]): handle_eop,
+        sys.intern(tokens["boc"]): handle_boc,
+        sys.intern(tokens["eoc"]): handle_eoc,
+        sys.intern(tokens["boe"]): handle_boe,
+        sys.intern(tokens["eoe"]): handle_eoe,
+    }
 
-        # Process Introduction data (e.g., !TITLE:, !AUTHORS:, etc.)
-        if state["intro"] and len(fields) > mi+1:
-            marker = fields[mi+1]
-            if marker == '!TITLE:':
-                if mi == 1:
-                    fields.pop(0)  # Remove the extra "!" token
-                fields.pop(0)  # Remove the !TITLE: marker
-                state["title"] = " ".join(fields)
-                state["tpage"] = True
-                continue
-            elif marker == '!AUTHORS:':
-                if mi == 1:
-                    fields.pop(0)
-                fields.pop(0)
-                state["author"] = " ".join(fields)
-                state["tpage"] = True
-                continue
-            elif marker == '!AFFILIATION:':
-                if mi == 1:
-                    fields.pop(0)
-                fields.pop(0)
-                state["affiliation"] = " ".join(fields)
-                state["tpage"] = True
-                continue
-            elif marker == '!DATE:':
-                if mi == 1:
-                    fields.pop(0)
-                fields.pop(0)
-                state["doc_date"] = " ".join(fields)
-                state["tpage"] = True
+    def process_file(f, filename, run_date):
+        """Processes a source file and generates the corresponding LaTeX output.
+
+        This function reads the file line by line, interprets documentation
+        markers (e.g., !BOI, !BOP, !ROUTINE:, !IROUTINE:, !DESCRIPTION:,
+        etc.), and generates the corresponding LaTeX commands.  Output is
+        accumulated in memory and returned as a single string; the caller is
+        responsible for writing it.
+
+        Args:
+            f (iterable of str): Input lines; an open file object or, for
+                regular files, a pre-split list of lines (see main).
+            filename (str): Name of the file (or '-' for STDIN).
+            run_date (str): Formatted timestamp of this run, shown in the
+                page headings (computed once in main).
+
+        Returns:
+            str: The LaTeX output for this file.
+        """
+        out.clear()
+
+        # Determine base file name and format it (replace underscores with "\_")
+        file_basename = os.path.basename(filename) if filename != '-' else "Standard Input"
+        file_basename = file_basename.translate(_UNDERSCORE_TBL)
+        append("\n\\markboth{Left}{Source File: %s,  Date: %s}\n" % (file_basename, run_date))
+
+        # Bind the methods used on every line to locals; CPython cannot hoist
+        # these attribute lookups out of the loop itself.
+        match_marker = _MARKER_RE.match
+        get_handler = handlers.get
+        intern = sys.intern
+
+        for line in f:
+            line = line.rstrip("\n").lstrip()
+            # Extract only the first token (or the second one when the line
+            # starts with a bare "!") instead of tokenizing the whole line.
+            m = match_marker(line)
+            if m is None:
                 continue
-            elif marker == '!INTRODUCTION:':
-                do_beg(state, opts.bare)
-                print(" %..............................................")
-                if mi == 1:
-                    fields.pop(0)
-                fields.pop(0)
-                print("\\section{" + " ".join(fields) + "}")
+            tok = m.group(1)
+            tok2 = m.group(2)
+            mi = 0
+            if tok == '!':
+                tok = tok2
+                # The line is just "!": skip it.
+                if tok is None:
+                    continue
+                mi = 1
+            # Short tokens are interned so the dict lookup and the marker
+            # comparisons below hit the identity fast path; long ones are the
+            # body text and never match a marker anyway.
+            if len(tok) < 20:
+                tok = intern(tok)
+
+            # --- Processing markers ---
+            handler = get_handler(tok)
+            if handler is not None:
+                handler(line.split(), mi)
                 continue
-        if fields[mi] == tokens["eoi"]:
-            print("\n %/////////////////////////////////////////////////////////////")
-            print("\\newpage")
-            state["intro"] = False
-            continue
 
-        # Prologue start: !BOP
-        if fields[mi] == tokens["bop"]:
-            if state["source"]:
-                do_eoc(state)
-            print("\n %/////////////////////////////////////////////////////////////")
-            do_beg(state, opts.bare)
-            if not state["first"]:
-                print("\n\\mbox{}\\hrulefill\\")
-            else:
-                if not opts.bare:
-                    print("\\section{Routine/Function Prologues} \\label{app:ProLogues}")
-            state["first"] = False
-            state["prologue"] = True
-            state["verb"] = False
-            state["source"] = False
-            set_missing(state)
-            continue
+            # Outside any documentation section no branch below can match, so
+            # skip the line after this single combined test.
+            if not (state["prologue"] or state["intro"] or state["source"]):
+                continue
 
-        # Internal prologue start: !BOPI
-        if fields[mi] == tokens["bopi"]:
-            if opts.internal:
-                state["prologue"] = False
-            else:
-                if state["source"]:
-                    do_eoc(state)
-                print("\n %/////////////////////////////////////////////////////////////")
-                do_beg(state, opts.bare)
-                if not state["first"]:
-                    print("\n\\mbox{}\\hrulefill\\")
+            # Process Introduction data (e.g., !TITLE:, !AUTHORS:, etc.)
+            if state["intro"]:
+                fields = line.split()
+                if len(fields) > mi+1:
+                    marker = fields[mi+1]
+                    if marker == '!TITLE:':
+                        state["title"] = " ".join(fields[mi+1:])
+                        state["tpage"] = True
+                        continue
+                    elif marker == '!AUTHORS:':
+                        state["author"] = " ".join(fields[mi+1:])
+                        state["tpage"] = True
+                        continue
+                    elif marker == '!AFFILIATION:':
+                        state["affiliation"] = " ".join(fields[mi+1:])
+                        state["tpage"] = True
+                        continue
+                    elif marker == '!DATE:':
+                        state["doc_date"] = " ".join(fields[mi+1:])
+                        state["tpage"] = True
+                        continue
+                    elif marker == '!INTRODUCTION:':
+                        do_beg(state, bare, append)
+                        append(" %..............................................")
+                        append("\\section{" + " ".join(fields[mi+1:]) + "}")
+                        continue
+
+            # Name markers (!MODULE:, !ROUTINE:, !IROUTINE:) are language
+            # independent, so they dispatch on literal patterns here; CPython
+            # compiles a match over literals into a jump rather than a chain
+            # of comparisons.
+            if state["prologue"]:
+                match tok:
+                    case '!MODULE:':
+                        fields = line.split()
+                        module_name = " ".join(fields[mi+1:]).translate(_UNDERSCORE_TBL)
+                        if new_page:
+                            append("\\newpage")
+                        if not no_source_info:
+                            append("\\subsection{Fortran:  Module Interface %s (Source File: %s)}\n" % (module_name, file_basename))
+                        else:
+                            append("\\subsection{Fortran:  Module Interface %s}\n" % module_name)
+                        state["have_name"] = True
+                        state["have_intf"] = True
+                        state["not_first"] = True
+                        continue
+                    case '!ROUTINE:':
+                        fields = line.split()
+                        routine_name = " ".join(fields[mi+1:]).translate(_UNDERSCORE_TBL)
+                        if new_page and state["not_first"]:
+                            append("\\newpage")
+                        if not no_source_info:
+                            append("\\subsubsection{%s (Source File: %s)}\n" % (routine_name, file_basename))
+                        else:
+                            append("\\subsubsection{%s}\n" % routine_name)
+                        state["have_name"] = True
+                        state["not_first"] = True
+                        continue
+                    case '!IROUTINE:':
+                        fields = line.split()
+                        routine_name = " ".join(fields[mi+1:]).translate(_UNDERSCORE_TBL)
+                        words = routine_name.split()
+                        label = words[1] if len(words) > 1 else ""
+                        append("\\subsubsection [%s]{%s}\n" % (label, routine_name))
+                        state["have_name"] = True
+                        continue
+
+            # !DESCRIPTION:
+            # Keyword markers always appear as the first or second token of the
+            # line (possibly after the comment token, e.g. "# !INTERFACE:"), so
+            # ordinary prologue text skips the substring scans below.
+            is_marker = tok.startswith('!') or (tok2 is not None and tok2.startswith('!'))
+
+            # The marker is either the first token or follows the comment
+            # token, so two equality tests replace a substring scan over the
+            # whole line.
+            if state["prologue"] and (tok == '!DESCRIPTION:' or tok2 == '!DESCRIPTION:'):
+                if state["verb"]:
+                    append("\\end{verbatim}")
+                    append("{\\sf DESCRIPTION:\\\\ }")
+                    append("")
+                    state["verb"] = False
+                if nolatex:
+                    append("\\begin{verbatim}")
+                    state["verb"] = True
                 else:
-                    if not opts.bare:
-                        print("\\section{Routine/Function Prologues} \\label{app:ProLogues}")
-                state["first"] = False
-                state["prologue"] = True
-                state["verb"] = False
-                state["source"] = False
-                set_missing(state)
-            continue
-
-        # !MODULE:
-        if state["prologue"] and fields[mi] == '!MODULE:':
-            if mi == 1:
-                fields.pop(0)
-            fields.pop(0)
-            module_name = " ".join(fields).replace("_", "\\_")
-            if opts.n:
-                print("\\newpage")
-            if not opts.f:
-                print("\\subsection{Fortran:  Module Interface %s (Source File: %s)}\n" % (module_name, file_basename))
-            else:
-                print("\\subsection{Fortran:  Module Interface %s}\n" % module_name)
-            state["have_name"] = True
-            state["have_intf"] = True
-            state["not_first"] = True
-            continue
-
-        # !ROUTINE:
-        if state["prologue"] and fields[mi] == '!ROUTINE:':
-            if mi == 1:
-                fields.pop(0)
-            fields.pop(0)
-            routine_name = " ".join(fields).replace("_", "\\_")
-            if opts.n and state["not_first"]:
-                print("\\newpage")
-            if not opts.f:
-                print("\\subsubsection{%s (Source File: %s)}\n" % (routine_name, file_basename))
-            else:
-                print("\\subsubsection{%s}\n" % routine_name)
-            state["have_name"] = True
-            state["not_first"] = True
-            continue
-
-        # !IROUTINE:
-        if state["prologue"] and fields[mi] == '!IROUTINE:':
-            if mi == 1:
-                fields.pop(0)
-            fields.pop(0)
-            routine_name = " ".join(fields).replace("_", "\\_")
-            words = routine_name.split()
-            label = words[1] if len(words) > 1 else ""
-            print("\\subsubsection [%s]{%s}\n" % (label, routine_name))
-            state["have_name"] = True
-            continue
-
-        # !DESCRIPTION:
-        if state["prologue"] and "!DESCRIPTION:" in line:
-            if state["verb"]:
-                print("\\end{verbatim}")
-                print("{\\sf DESCRIPTION:\\\\ }")
-                print("")
-                state["verb"] = False
-            if opts.nolatex:
-                print("\\begin{verbatim}")
-                state["verb"] = True
-            else:
-                parts = line.split()
-                start = 1 if parts[0] == '!' else 0
-                print(" ".join(parts[start+1:]))
-            state["have_desc"] = True
-            continue
+                    # mi already tells whether the line starts with a bare
+                    # "!", so the marker position needs no re-derivation.
+                    append(" ".join(line.split()[mi+1:]))
+                state["have_desc"] = True
+                continue
 
-        # Process optional keyword markers (e.g., !INTERFACE:, !REVISION HISTORY:, etc.)
-        processed_key = False
-        if state["prologue"]:
-            for key in opts.keys:
-                if key in line:
+            # Process optional keyword markers (e.g., !INTERFACE:, !REVISION HISTORY:, etc.)
+            if state["prologue"] and is_marker and key_search is not None:
+                key_match = key_search(line)
+                if key_match is not None:
+                    key = key_match.group(0)
                     if state["verb"]:
-                        print("\\end{verbatim}")
+                        append("\\end{verbatim}")
                         state["verb"] = False
                     else:
-                        print("\n\\bigskip")
+                        append("\n\\bigskip")
                     label = key[1:]  # Remove the "!" from the marker
-                    if any(x in line for x in ["USES", "INPUT", "OUTPUT", "PARAMETERS", "VALUE", "ARGUMENTS"]):
-                        print("{\\em " + label + "}")
+                    if key in em_keys:
+                        append("{\\em " + label + "}")
                     else:
-                        print("{\\sf " + label + "}")
-                    print("\\begin{verbatim}")
+                        append("{\\sf " + label + "}")
+                    append("\\begin{verbatim}")
                     state["verb"] = True
-                    processed_key = True
-                    break
-            if processed_key:
+                    continue
+
+            # If in prologue or introduction, print the line (removing the initial comment token if present)
+            if state["prologue"] or state["intro"]:
+                if line.startswith(comment):
+                    line = line[comment_len:]
+                append(line)
                 continue
 
-        # End of prologue: !EOP or !EOPI
-        if fields[mi] in (tokens["eop"], tokens["eopi"]):
-            if state["verb"]:
-                print("\\end{verbatim}")
-                state["verb"] = False
-            state["prologue"] = False
-            continue
+            # If in code source section, print the line as-is.
+            if state["source"]:
+                append(line)
+                continue
 
-        # Code section: !BOC and !EOC
-        if fields[mi] == tokens["boc"]:
-            print("\n %/////////////////////////////////////////////////////////////")
-            state["first"] = False
-            state["prologue"] = False
-            state["source"] = True
-            print("\n\\begin{verbatim}")
-            state["verb"] = True
-            continue
-        if fields[mi] == tokens["eoc"]:
-            do_eoc(state)
-            state["prologue"] = False
-            continue
+        # End of file processing
+        append("")
+        if state["source"]:
+            do_eoc(state, append)
+        append("%...............................................................")
+        return "\n".join(out) + "\n"
 
-        # Example prologue: !BOE and !EOE
-        if fields[mi] == tokens["boe"]:
-            if state["source"]:
-                do_eoc(state)
-            print("\n %/////////////////////////////////////////////////////////////")
-            state["first"] = False
-            state["prologue"] = True
-            state["verb"] = False
-            state["source"] = False
-            continue
-        if fields[mi] == tokens["eoe"]:
-            if state["verb"]:
-                print("\\end{verbatim}")
-                state["verb"] = False
-            state["prologue"] = False
-            continue
+    return process_file
 
-        # If in prologue or introduction, print the line (removing the initial comment token if present)
-        if state["prologue"] or state["intro"]:
-            if line.startswith(tokens["comment"]):
-                line = line[len(tokens["comment"]):]
-            print(line)
-            continue
 
-        # If in code source section, print the line as-is.
-        if state["source"]:
-            print(line)
-            continue
+def process_file_worker(args):
+    """Processes one input file in a worker process (see --jobs).
 
-    # End of file processing
-    print("")
-    if state["source"]:
-        do_eoc(state)
-    print("%...............................................................")
+    Each worker renders its file with an independent document state: the
+    first file starts from a fresh state, and later files are rendered as if
+    an earlier file had already opened the document and the prologue section.
+    The final state is returned with the output so main can tell whether the
+    first file actually opened the document (and, if not, emit the document
+    header itself from the title material that file captured).
+
+    Args:
+        args (tuple): (filename, tokens, opts, run_date, first), where first
+            indicates whether this is the first file on the command line.
+
+    Returns:
+        tuple: The LaTeX output for the file and the final document state.
+    """
+    filename, tokens, opts, run_date, first = args
+    state = initial_state()
+    if not first:
+        state["begdoc"] = True
+        state["first"] = False
+        state["not_first"] = True
+    process_file = make_processor(state, tokens, opts)
+    with open(filename, 'r', buffering=1 << 20, encoding='utf-8', errors='replace') as f:
+        lines = f.read().split("\n")
+    return process_file(lines, filename, run_date), state
 
 
 def main():
@@ -536,6 +810,11 @@ def main():
     ], help="List of optional keyword markers")
     parser.add_argument("--style", type=str, default=None,
                         help="Custom LaTeX style or document class to use (e.g., 'myStyle')")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reuse cached output for unchanged input files (stored under ~/.cache/protex)")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="Process input files with N worker processes; assumes each file is "
+                             "self-contained (no intro or code section spanning files)")
     opts = parser.parse_args()
 
     # Determine the language; Fortran90 is the default.
@@ -607,42 +886,115 @@ def main():
     comment_string = tokens["comment"]
 
     # Global state of the document
-    state = {
-        "intro": False,
-        "prologue": False,
-        "first": True,
-        "source": False,
-        "verb": False,
-        "tpage": False,
-        "begdoc": False,
-        "not_first": False,
-        "have_name": False,
-        "have_desc": False,
-        "have_intf": False,
-        "have_hist": False,
-        "name_is": "UNKNOWN",
-        "title": "",
-        "author": "",
-        "affiliation": "",
-        "doc_date": ""
-    }
+    state = initial_state()
 
     files = opts.files if opts.files else ['-']
-    
+
+    # All output goes through the binary stdout layer, which is block
+    # buffered even on a terminal; per-file text is encoded once rather
+    # than line by line through the text wrapper.
+    out_write = sys.stdout.buffer.write
+
     print_notice()
     if not opts.bare:
         print_preamble(opts.style)
     print_macros()
 
+    # Read input through a 1 MiB buffer.  The default buffer size is derived
+    # from st_blksize, which can degrade to tiny buffers (and many read
+    # syscalls) on network or FUSE filesystems; the explicit size is passed
+    # through to the underlying BufferedReader.
+    read_buffer = 1 << 20
+
+    # One timestamp for the whole run; avoids a localtime/strftime round trip
+    # per file and keeps the page headings consistent across files.
+    run_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # Specialize the processing function once for the selected language and
+    # option set (see make_processor).
+    process_file = make_processor(state, tokens, opts)
+
+    # Parallel mode: render the files in worker processes and write the
+    # results in command-line order.  Cross-file state is approximated as
+    # documented in process_file_worker, so this path is opt-in.
+    if opts.jobs > 1 and len(files) > 1 and all(p not in ('-', '') for p in files):
+        work = [(p, tokens, opts, run_date, i == 0) for i, p in enumerate(files)]
+        chunksize = max(1, len(files) // (opts.jobs * 4))
+        with ProcessPoolExecutor(max_workers=opts.jobs) as pool:
+            for i, (output, wstate) in enumerate(
+                    pool.map(process_file_worker, work, chunksize=chunksize)):
+                out_write(output.encode("utf-8"))
+                # Later workers are primed as if the document were already
+                # open, so if the first file had no prologue the header
+                # (\title material and \begin{document}) must be emitted
+                # here, between the first and second files.
+                if i == 0 and not opts.bare and not wstate["begdoc"]:
+                    parts = []
+                    do_beg(wstate, opts.bare, parts.append)
+                    if wstate["first"]:
+                        parts.append("\\section{Routine/Function Prologues} \\label{app:ProLogues}")
+                    out_write(("\n".join(parts) + "\n").encode("utf-8"))
+        if not opts.bare:
+            out_write(_END_DOCUMENT_BYTES)
+        return
+
+    cache_base = cache_dir() if opts.cache else None
+
+    # Pre-read upcoming files on one background thread so disk latency
+    # overlaps with processing of the current file.  Processing order (and
+    # therefore output order) is unchanged.
+    def read_bytes(path):
+        with open(path, 'rb', buffering=read_buffer) as f:
+            return f.read()
+
+    reader = None
+    reads = {}
+    regular_files = [p for p in files if p not in ('-', '')]
+    if regular_files:
+        reader = ThreadPoolExecutor(max_workers=1)
+        reads = {p: reader.submit(read_bytes, p) for p in regular_files}
+
     for filename in files:
         if filename == '-' or filename == '':
-            process_file(sys.stdin, filename, state, tokens, opts)
-        else:
-            with open(filename, 'r') as f:
-                process_file(f, filename, state, tokens, opts)
-    
+            stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace')
+            out_write(process_file(stdin, filename, run_date).encode("utf-8"))
+            continue
+
+        # With --cache, replay the stored output for unchanged files; the key
+        # covers the entering document state, so a hit is output-identical to
+        # reprocessing (only the embedded timestamp is refreshed).
+        entry_path = None
+        if cache_base is not None:
+            try:
+                entry_path = os.path.join(
+                    cache_base,
+                    cache_key(filename, os.stat(filename), state, tokens, opts) + ".json")
+            except OSError:
+                entry_path = None
+            if entry_path is not None:
+                entry = cache_load(entry_path)
+                if entry is not None:
+                    out_write(entry["output"].replace(entry["run_date"], run_date).encode("utf-8"))
+                    state.update(entry["state"])
+                    continue
+
+        # Regular files were slurped by the reader thread; decode and split
+        # once so the hot loop iterates an in-memory line list.  Stdin
+        # (above) keeps the streaming path.
+        # Normalize CR/LF endings the way text mode's universal newlines
+        # would, so CRLF input does not leak stray "\r" into the output.
+        text = reads[filename].result().decode('utf-8', 'replace')
+        lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        output = process_file(lines, filename, run_date)
+        out_write(output.encode("utf-8"))
+        if entry_path is not None:
+            cache_store(entry_path, output, state, run_date)
+
+    if reader is not None:
+        reader.shutdown()
+
     if not opts.bare:
-        print("\\end{document}")
+        out_write(_END_DOCUMENT_BYTES)
 
 
 if __name__ == "__main__":